@@ -1,16 +1,36 @@
+import json
+import random
+import threading
 import time
 import requests
+from dataclasses import asdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
+from urllib3.util.retry import Retry
 from typing import Dict, Optional, Any, List
 import logging
 
 from config import (
-    AURA_CLIENT_ID, AURA_CLIENT_SECRET, AURA_TENANT_ID,
-    AURA_API_BASE, OAUTH_TOKEN_URL, DEFAULT_MAX_RETRIES, DEFAULT_RETRY_INTERVAL
+    AURA_CLIENT_ID, AURA_CLIENT_SECRET, AURA_TENANT_ID, InstanceConfig,
+    AURA_API_BASE, OAUTH_TOKEN_URL, DEFAULT_MAX_WAIT, DEFAULT_INITIAL_RETRY_INTERVAL,
+    DEFAULT_MAX_RETRY_INTERVAL, RETRY_BACKOFF_FACTOR, MAX_PARALLEL_REQUESTS,
+    MAX_PARALLEL_DELETES
 )
 
 logger = logging.getLogger(__name__)
 
+INSTANCES_URL = f"{AURA_API_BASE}/instances"
+
+TOKEN_EXPIRY_MARGIN = 300
+TOKEN_REFRESH_LEAD = 60
+
+def _json(response: requests.Response) -> Any:
+    return json.loads(response.content)
+
+def _next_retry_interval(delay: float) -> float:
+    return min(delay * RETRY_BACKOFF_FACTOR, DEFAULT_MAX_RETRY_INTERVAL) + random.uniform(0, 0.5)
+
 class AuraAPIError(Exception):
     pass
 
@@ -18,14 +38,35 @@ class AuraClient:
     def __init__(self):
         self._access_token: Optional[str] = None
         self._token_expires_at: float = 0
+        self._headers: Optional[Dict[str, str]] = None
+        self._token_lock = threading.Lock()
+        self._refresh_timer: Optional[threading.Timer] = None
+        self._closed = False
+        self._session = self._create_session()
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+        session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retries))
+        session.headers["Content-Type"] = "application/json"
+        return session
 
     def _get_access_token(self) -> str:
-        current_time = time.time()
-        if self._access_token and current_time < (self._token_expires_at - 300):
+        if self._token_is_valid():
             return self._access_token
 
+        with self._token_lock:
+            if self._token_is_valid():
+                return self._access_token
+            return self._refresh_token()
+
+    def _token_is_valid(self) -> bool:
+        return bool(self._access_token) and time.monotonic() < (self._token_expires_at - TOKEN_EXPIRY_MARGIN)
+
+    def _refresh_token(self) -> str:
+        current_time = time.monotonic()
         try:
-            response = requests.post(
+            response = self._session.post(
                 OAUTH_TOKEN_URL,
                 data={"grant_type": "client_credentials"},
                 headers={"Content-Type": "application/x-www-form-urlencoded"},
@@ -34,43 +75,76 @@ class AuraClient:
             )
             response.raise_for_status()
 
-            token_data = response.json()
+            token_data = _json(response)
             self._access_token = token_data["access_token"]
+            self._headers = {"Authorization": f"Bearer {self._access_token}"}
             expires_in = token_data.get("expires_in", 3600)
             self._token_expires_at = current_time + expires_in
+            self._schedule_token_refresh(expires_in)
 
             return self._access_token
 
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             raise AuraAPIError(f"Failed to get access token: {e}")
 
-    def _get_headers(self) -> Dict[str, str]:
-        return {
-            "Authorization": f"Bearer {self._get_access_token()}",
-            "Content-Type": "application/json"
-        }
+    def _schedule_token_refresh(self, expires_in: float) -> None:
+        if self._refresh_timer:
+            self._refresh_timer.cancel()
+            self._refresh_timer = None
+        if self._closed:
+            return
+
+        delay = expires_in - TOKEN_EXPIRY_MARGIN - TOKEN_REFRESH_LEAD
+        if delay <= 0:
+            return
+
+        self._refresh_timer = threading.Timer(delay, self._refresh_token_async)
+        self._refresh_timer.daemon = True
+        self._refresh_timer.start()
+
+    def _refresh_token_async(self) -> None:
+        with self._token_lock:
+            if self._closed:
+                return
+            try:
+                self._refresh_token()
+                logger.debug("Refreshed access token in the background")
+            except AuraAPIError as e:
+                logger.warning(f"Background token refresh failed, will retry on next request: {e}")
+
+    def close(self) -> None:
+        with self._token_lock:
+            self._closed = True
+            if self._refresh_timer:
+                self._refresh_timer.cancel()
+                self._refresh_timer = None
+        self._session.close()
 
-    def create_database(self, name: str, instance_config: Dict[str, Any], 
+    def _ensure_headers(self) -> Optional[Dict[str, str]]:
+        self._get_access_token()
+        return self._headers
+
+    def create_database(self, name: str, instance_config: InstanceConfig, 
                        source_instance_id: Optional[str] = None) -> Dict[str, Any]:
         payload = {
             "name": name,
             "tenant_id": AURA_TENANT_ID,
-            **instance_config
+            **asdict(instance_config)
         }
 
         if source_instance_id:
             payload["source_instance_id"] = source_instance_id
 
         try:
-            response = requests.post(
-                f"{AURA_API_BASE}/instances",
+            response = self._session.post(
+                INSTANCES_URL,
                 json=payload,
-                headers=self._get_headers(),
+                headers=self._ensure_headers(),
                 timeout=60
             )
             response.raise_for_status()
 
-            db_info = response.json()["data"]
+            db_info = _json(response)["data"]
             logger.info(f"{'Cloned' if source_instance_id else 'Created'} database '{name}' with ID: {db_info['id']}")
 
             return {
@@ -80,29 +154,29 @@ class AuraClient:
                 "password": db_info["password"]
             }
 
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             error_msg = f"Failed to {'clone' if source_instance_id else 'create'} database '{name}': {e}"
             logger.error(error_msg)
             raise AuraAPIError(error_msg)
 
     def get_database_status(self, db_id: str) -> str:
         try:
-            response = requests.get(
-                f"{AURA_API_BASE}/instances/{db_id}",
-                headers=self._get_headers(),
+            response = self._session.get(
+                f"{INSTANCES_URL}/{db_id}",
+                headers=self._ensure_headers(),
                 timeout=30
             )
             response.raise_for_status()
-            return response.json()["data"]["status"]
+            return _json(response)["data"]["status"]
 
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             raise AuraAPIError(f"Failed to get status for database {db_id}: {e}")
 
     def delete_database(self, db_id: str, db_name: str) -> bool:
         try:
-            response = requests.delete(
-                f"{AURA_API_BASE}/instances/{db_id}",
-                headers=self._get_headers(),
+            response = self._session.delete(
+                f"{INSTANCES_URL}/{db_id}",
+                headers=self._ensure_headers(),
                 timeout=30
             )
 
@@ -114,68 +188,97 @@ class AuraClient:
                 logger.error(f"Response: {response.text}")
                 return False
 
-        except requests.RequestException as e:
+        except (requests.RequestException, AuraAPIError) as e:
             logger.error(f"❌ Error deleting database '{db_name}' (ID: {db_id}): {e}")
             return False
 
-    def batch_delete_databases(self, databases: Dict[str, Dict[str, Any]], 
-                              confirm: bool = True) -> Dict[str, bool]:
+    def batch_delete_databases(self, databases: Dict[str, Dict[str, Any]]) -> Dict[str, bool]:
         if not databases:
             logger.warning("No databases to delete")
             return {}
 
-        logger.info(f"Found {len(databases)} databases to delete:")
-        for db_name in databases.keys():
-            logger.info(f"  - {db_name}")
-
-        if confirm:
-            response = input("\nAre you sure you want to delete these databases? (yes/no): ")
-            if response.lower() not in ['yes', 'y']:
-                logger.info("Delete cancelled")
-                return {}
-
         results = {}
-        success_count = 0
 
-        for db_name, creds in databases.items():
-            db_id = creds.get('db_id')
-            if not db_id:
-                logger.error(f"No database ID found for '{db_name}', skipping")
-                results[db_name] = False
-                continue
+        with ThreadPoolExecutor(max_workers=min(len(databases), MAX_PARALLEL_DELETES)) as executor:
+            futures = {}
+            for db_name, creds in databases.items():
+                db_id = creds.get('db_id')
+                if not db_id:
+                    logger.error(f"No database ID found for '{db_name}', skipping")
+                    results[db_name] = False
+                    continue
+                futures[executor.submit(self.delete_database, db_id, db_name)] = db_name
 
-            success = self.delete_database(db_id, db_name)
-            results[db_name] = success
-            if success:
-                success_count += 1
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+
+        results = {db_name: results[db_name] for db_name in databases}
+        success_count = sum(results.values())
 
         logger.info(f"✅ Successfully deleted {success_count}/{len(databases)} databases")
         return results
 
-    def wait_for_database_ready(self, db_id: str, max_retries: int = DEFAULT_MAX_RETRIES,
-                               retry_interval: int = DEFAULT_RETRY_INTERVAL) -> bool:
-        logger.info(f"Waiting for database {db_id} to be ready...")
-
-        for attempt in range(max_retries):
-            try:
-                status = self.get_database_status(db_id)
-                logger.info(f"Database {db_id} status: {status} (attempt {attempt + 1}/{max_retries})")
-
-                if status == "running":
-                    logger.info(f"Database {db_id} is now running")
+    def wait_for_database_ready(self, db_id: str, max_total_wait: int = DEFAULT_MAX_WAIT) -> bool:
+        return self.wait_for_databases_ready([db_id], max_total_wait)
+
+    def wait_for_databases_ready(self, db_ids: List[str], max_total_wait: int = DEFAULT_MAX_WAIT) -> bool:
+        pending = set(db_ids)
+        if not pending:
+            return True
+
+        if len(pending) == 1:
+            logger.info(f"Waiting for database {db_ids[0]} to be ready...")
+        else:
+            logger.info(f"Waiting for {len(pending)} databases to be ready...")
+
+        deadline = time.monotonic() + max_total_wait
+        delay = DEFAULT_INITIAL_RETRY_INTERVAL
+        last_statuses: Dict[str, str] = {}
+        attempt = 0
+
+        with ThreadPoolExecutor(max_workers=min(len(pending), MAX_PARALLEL_REQUESTS)) as executor:
+            while True:
+                attempt += 1
+                polled = [db_id for db_id in db_ids if db_id in pending]
+                statuses = {
+                    db_id: status
+                    for db_id, status in zip(polled, executor.map(self._poll_database_status, polled))
+                    if status is not None
+                }
+                if statuses:
+                    logger.info(
+                        f"Database status (attempt {attempt}): "
+                        + ", ".join(f"{db_id}: {status}" for db_id, status in statuses.items())
+                    )
+
+                for db_id, status in statuses.items():
+                    if status in ["failed", "error"]:
+                        logger.error(f"Database {db_id} failed to start")
+                        return False
+                    if status != "running" and status != last_statuses.get(db_id):
+                        delay = DEFAULT_INITIAL_RETRY_INTERVAL
+                    last_statuses[db_id] = status
+
+                running = [db_id for db_id, status in statuses.items() if status == "running"]
+                if running:
+                    pending.difference_update(running)
+                    logger.info(f"Database(s) {', '.join(running)} now running")
+
+                if not pending:
                     return True
 
-                if status in ["failed", "error"]:
-                    logger.error(f"Database {db_id} failed to start")
-                    return False
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                time.sleep(min(delay, remaining))
+                delay = _next_retry_interval(delay)
 
-                time.sleep(retry_interval)
+        logger.warning(f"Database(s) {', '.join(sorted(pending))} did not reach 'running' status within {max_total_wait} seconds")
+        return False
 
-            except AuraAPIError as e:
-                logger.error(f"Error checking database status: {e}")
-                if attempt == max_retries - 1:
-                    return False
-                time.sleep(retry_interval)
-
-        logger.error(f"Database {db_id} did not reach 'running' status within {max_retries} attempts")
-        return False
\ No newline at end of file
+    def _poll_database_status(self, db_id: str) -> Optional[str]:
+        try:
+            return self.get_database_status(db_id)
+        except AuraAPIError as e:
+            logger.error(f"Error checking database status: {e}")
+            return None
\ No newline at end of file
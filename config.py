@@ -1,4 +1,5 @@
 import os
+from dataclasses import dataclass
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -9,17 +10,23 @@ AURA_TENANT_ID = os.getenv("AURA_TENANT_ID")
 AURA_API_BASE = "https://api.neo4j.io/v1"
 OAUTH_TOKEN_URL = "https://api.neo4j.io/oauth/token"
 
-DEFAULT_INSTANCE_CONFIG = {
-    "version": "5",
-    "region": "europe-west1",
-    "memory": "2GB",
-    "type": "enterprise-db",
-    "cloud_provider": "gcp"
-}
+@dataclass(frozen=True)
+class InstanceConfig:
+    version: str = "5"
+    region: str = "europe-west1"
+    memory: str = "2GB"
+    type: str = "enterprise-db"
+    cloud_provider: str = "gcp"
 
-DEFAULT_MAX_RETRIES = 30
-DEFAULT_RETRY_INTERVAL = 10
+DEFAULT_MAX_WAIT = 300
+CLONE_MAX_WAIT = 900
+DEFAULT_INITIAL_RETRY_INTERVAL = 2
+DEFAULT_MAX_RETRY_INTERVAL = 30
+RETRY_BACKOFF_FACTOR = 1.5
 DEFAULT_CREDENTIALS_FILE = "db_credentials.json"
+MAX_PARALLEL_REQUESTS = 16
+MAX_PARALLEL_UPLOADS = 4
+MAX_PARALLEL_DELETES = 8
 
 def validate_environment():
     missing = []
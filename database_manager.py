@@ -1,11 +1,13 @@
 import os
 import json
 import logging
-from typing import Dict, Any, List, Optional
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Any, List, Optional
 from pathlib import Path
 
 from aura_client import AuraClient, AuraAPIError
-from config import DEFAULT_CREDENTIALS_FILE
+from config import DEFAULT_CREDENTIALS_FILE, CLONE_MAX_WAIT, MAX_PARALLEL_REQUESTS, MAX_PARALLEL_UPLOADS, InstanceConfig
 
 logger = logging.getLogger(__name__)
 
@@ -14,8 +16,11 @@ class DatabaseManager:
     def __init__(self):
         self.client = AuraClient()
     
+    def close(self) -> None:
+        self.client.close()
+    
     def create_databases_with_clones(self, nb_instances: int, name: str, 
-                                   instance_config: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+                                   instance_config: InstanceConfig) -> Dict[str, Dict[str, Any]]:
         if nb_instances < 1:
             raise ValueError("nb_instances must be at least 1")
         
@@ -32,7 +37,7 @@ class DatabaseManager:
                 logger.error(f"Primary database '{primary_db_name}' failed to start")
                 return results
             
-            self._load_database_dump(primary_db)
+            self._load_database_dumps([primary_db])
             
             if nb_instances > 1:
                 clone_results = self._create_clones(
@@ -40,13 +45,17 @@ class DatabaseManager:
                 )
                 results.update(clone_results)
                 
+                clone_ids = [clone["db_id"] for clone in clone_results.values()]
+                if clone_ids and not self.client.wait_for_databases_ready(clone_ids, max_total_wait=CLONE_MAX_WAIT):
+                    logger.warning("Some cloned databases are not running yet, check their status in the Aura console")
+                
         except AuraAPIError as e:
             logger.error(f"Failed to create primary database: {e}")
         
         return results
     
     def add_cloned_instances(self, nb_instances: int, base_name: str, 
-                           instance_config: Dict[str, Any], 
+                           instance_config: InstanceConfig, 
                            credentials_file: str = DEFAULT_CREDENTIALS_FILE) -> Dict[str, Dict[str, Any]]:
         if nb_instances < 1:
             raise ValueError("nb_instances must be at least 1")
@@ -75,9 +84,11 @@ class DatabaseManager:
         
         return results
     
-    def delete_all_instances(self, credentials_file: str = DEFAULT_CREDENTIALS_FILE, 
-                           confirm: bool = True, base_name: Optional[str] = None) -> bool:
-        databases = self._load_existing_credentials(credentials_file)
+    def delete_all_instances(self, credentials_file: str = DEFAULT_CREDENTIALS_FILE, *,
+                           confirm: Optional[Callable[[Dict[str, Dict[str, Any]]], bool]],
+                           base_name: Optional[str] = None) -> bool:
+        original_databases = self._load_existing_credentials(credentials_file)
+        databases = original_databases
         
         if not databases:
             logger.warning(f"No database credentials found in '{credentials_file}'")
@@ -85,7 +96,7 @@ class DatabaseManager:
         
         if base_name:
             filtered_databases = {
-                name: creds for name, creds in databases.items()
+                name: creds for name, creds in original_databases.items()
                 if name.startswith(f"{base_name}-")
             }
             if filtered_databases:
@@ -95,7 +106,16 @@ class DatabaseManager:
                 logger.warning(f"No databases found with base name '{base_name}'")
                 return False
         
-        results = self.client.batch_delete_databases(databases, confirm)
+        logger.info(
+            f"Found {len(databases)} databases to delete:\n"
+            + "\n".join(f"  - {db_name}" for db_name in databases)
+        )
+        
+        if confirm and not confirm(databases):
+            logger.info("Delete cancelled")
+            return True
+        
+        results = self.client.batch_delete_databases(databases)
         
         if any(results.values()):
             remaining_databases = {
@@ -104,7 +124,6 @@ class DatabaseManager:
             }
             
             if base_name:
-                original_databases = self._load_existing_credentials(credentials_file)
                 for name, creds in original_databases.items():
                     if not name.startswith(f"{base_name}-"):
                         remaining_databases[name] = creds
@@ -124,52 +143,83 @@ class DatabaseManager:
         return success_count == total_count
     
     def _create_clones(self, source_db_id: str, base_name: str, start_index: int, 
-                      end_index: int, instance_config: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+                      end_index: int, instance_config: InstanceConfig) -> Dict[str, Dict[str, Any]]:
         results = {}
+        clone_names = [f"{base_name}-{i}" for i in range(start_index, end_index + 1)]
+        
+        logger.info(
+            f"Creating {len(clone_names)} clones:\n"
+            + "\n".join(f"  - {clone_name}" for clone_name in clone_names)
+        )
         
-        for i in range(start_index, end_index + 1):
-            clone_name = f"{base_name}-{i}"
-            logger.info(f"Creating clone '{clone_name}'...")
+        with ThreadPoolExecutor(max_workers=min(len(clone_names), MAX_PARALLEL_REQUESTS) or 1) as executor:
+            futures = {}
+            for clone_name in clone_names:
+                futures[executor.submit(
+                    self.client.create_database, clone_name, instance_config, source_db_id
+                )] = clone_name
             
-            try:
-                clone_info = self.client.create_database(
-                    clone_name, instance_config, source_db_id
-                )
-                results[clone_name] = clone_info
-                
-            except AuraAPIError as e:
-                logger.error(f"Failed to create clone '{clone_name}': {e}")
-                continue
+            for future in as_completed(futures):
+                clone_name = futures[future]
+                try:
+                    results[clone_name] = future.result()
+                except AuraAPIError as e:
+                    logger.error(f"Failed to create clone '{clone_name}': {e}")
         
-        return results
+        return {name: results[name] for name in clone_names if name in results}
     
-    def _load_database_dump(self, db_info: Dict[str, Any]) -> None:
+    def _load_database_dumps(self, dbs: List[Dict[str, Any]]) -> None:
+        if not dbs:
+            return
+        
         dump_path = Path.cwd() / "dumps"
         
         if not dump_path.exists():
             logger.warning(f"Dump directory '{dump_path}' not found. Skipping data load.")
             return
         
-        docker_command = (
-            f'docker run --rm -v {dump_path}:/dumps '
-            f'neo4j:2025.04.0-enterprise '
-            f'bash -c "'
-            f'./bin/neo4j-admin database upload neo4j '
-            f'--from-path=/dumps '
+        with ThreadPoolExecutor(max_workers=min(len(dbs), MAX_PARALLEL_UPLOADS)) as executor:
+            exit_codes = list(executor.map(lambda db_info: self._run_upload(db_info, dump_path), dbs))
+        
+        if len(dbs) > 1:
+            success_count = exit_codes.count(0)
+            logger.info(f"Loaded dump into {success_count}/{len(dbs)} databases")
+    
+    def _run_upload(self, db_info: Dict[str, Any], dump_path: Path) -> int:
+        upload_command = (
+            './bin/neo4j-admin database upload neo4j '
+            '--from-path=/dumps '
             f'--to-uri=neo4j+s://{db_info["db_id"]}.databases.neo4j.io '
-            f'--overwrite-destination=true '
-            f'--to-password={db_info["password"]} '
-            f'--to-user=neo4j"'
+            '--overwrite-destination=true '
+            '--to-password="$AURA_DB_PASSWORD" '
+            '--to-user=neo4j'
         )
+        docker_command = [
+            "docker", "run", "--rm",
+            "-e", "AURA_DB_PASSWORD",
+            "-v", f"{dump_path}:/dumps",
+            "neo4j:2025.04.0-enterprise",
+            "bash", "-c", upload_command
+        ]
         
         logger.info(f"Loading dump into database {db_info['db_id']}...")
-        logger.debug(f"Docker command: {docker_command}")
+        logger.debug(f"Docker command: {' '.join(docker_command)}")
+        
+        try:
+            exit_code = subprocess.run(
+                docker_command,
+                env={**os.environ, "AURA_DB_PASSWORD": db_info["password"]},
+                check=False
+            ).returncode
+        except OSError as e:
+            logger.error(f"Failed to run docker: {e}")
+            return -1
         
-        exit_code = os.system(docker_command)
         if exit_code == 0:
-            logger.info("Database dump loaded successfully")
+            logger.info(f"Database dump loaded successfully into {db_info['db_id']}")
         else:
-            logger.error(f"Failed to load database dump (exit code: {exit_code})")
+            logger.error(f"Failed to load database dump into {db_info['db_id']} (exit code: {exit_code})")
+        return exit_code
     
     def _load_existing_credentials(self, credentials_file: str) -> Dict[str, Dict[str, Any]]:
         try:
@@ -195,22 +245,25 @@ class DatabaseManager:
             return {}
     
     def _find_next_available_index(self, base_name: str, existing_dbs: Dict[str, Any]) -> int:
-        index = 1
-        while f"{base_name}-{index}" in existing_dbs:
-            index += 1
-        return index
+        prefix = f"{base_name}-"
+        return max(
+            (int(name[len(prefix):]) for name in existing_dbs
+             if name.startswith(prefix) and name[len(prefix):].isdecimal()),
+            default=0
+        ) + 1
     
     def store_credentials(self, databases: Dict[str, Dict[str, Any]], 
                          filename: str = DEFAULT_CREDENTIALS_FILE) -> None:
         try:
-            credentials_data = {}
-            for db_name, creds in databases.items():
-                credentials_data[db_name] = {
+            credentials_data = {
+                db_name: {
                     "db_id": creds["db_id"],
                     "connection_url": creds["connection_url"],
                     "username": creds["username"],
                     "password": creds["password"]
                 }
+                for db_name, creds in databases.items()
+            }
             
             with open(filename, "w") as file:
                 json.dump(credentials_data, file, indent=2)
@@ -1,22 +1,42 @@
 import argparse
+import atexit
 import logging
+import queue
 import sys
-from typing import Dict, Any
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Any, Optional
 
-from config import DEFAULT_INSTANCE_CONFIG, validate_environment
+from config import InstanceConfig, validate_environment
 from database_manager import DatabaseManager
 
+_log_queue: Optional[queue.Queue] = None
+
 def setup_logging(level: str = "INFO") -> None:
-    logging.basicConfig(
-        level=getattr(logging, level.upper()),
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            logging.FileHandler('aura_setup.log')
-        ]
-    )
+    global _log_queue
+    
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handlers = [
+        logging.StreamHandler(sys.stdout),
+        logging.FileHandler('aura_setup.log')
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    _log_queue = queue.Queue(-1)
+    listener = QueueListener(_log_queue, *handlers, respect_handler_level=True)
+    
+    root_logger = logging.getLogger()
+    root_logger.setLevel(getattr(logging, level.upper()))
+    root_logger.addHandler(QueueHandler(_log_queue))
+    
+    listener.start()
+    atexit.register(listener.stop)
 
-def parse_arguments() -> argparse.Namespace:
+def flush_logging() -> None:
+    if _log_queue is not None:
+        _log_queue.join()
+
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Create, clone, and manage Neo4j Aura databases for PS trainings and workshops.",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -32,11 +52,7 @@ def parse_arguments() -> argparse.Namespace:
             python main.py --mode=delete
             
             # Delete only databases with specific base name
-<<<<<<< HEAD
-            python main.py --mode delete --name=MS_TRAINING_AUTOMATION_TEST
-=======
-            python main.py --mode delete --name MS_TRAINING_AUTOMATION_TEST
->>>>>>> 9c116d8 (Updated readme and examples)
+            python main.py --mode=delete --name=MS_TRAINING_AUTOMATION_TEST
         """
     )
     
@@ -67,18 +83,26 @@ def parse_arguments() -> argparse.Namespace:
                        help="Logging level (default: INFO)")
     parser.add_argument("--force", action="store_true", help="Skip confirmation prompts (for delete mode)")
     
-    return parser.parse_args()
+    return parser
+
+_PARSER = _build_parser()
+
+def parse_arguments() -> argparse.Namespace:
+    return _PARSER.parse_args()
+
+def build_instance_config(args: argparse.Namespace) -> InstanceConfig:
+    return InstanceConfig(
+        version=args.version,
+        region=args.region,
+        memory=args.memory,
+        type=args.type,
+        cloud_provider=args.cloud_provider
+    )
 
-def build_instance_config(args: argparse.Namespace) -> Dict[str, Any]:
-    config = DEFAULT_INSTANCE_CONFIG.copy()
-    config.update({
-        "version": args.version,
-        "region": args.region,
-        "memory": args.memory,
-        "type": args.type,
-        "cloud_provider": args.cloud_provider
-    })
-    return config
+def confirm_deletion(databases: Dict[str, Dict[str, Any]]) -> bool:
+    flush_logging()
+    response = input(f"\nAre you sure you want to delete these {len(databases)} databases? (yes/no): ")
+    return response.lower() in ['yes', 'y']
 
 def handle_delete_mode(args: argparse.Namespace, db_manager: DatabaseManager) -> bool:
     logger = logging.getLogger(__name__)
@@ -89,7 +113,7 @@ def handle_delete_mode(args: argparse.Namespace, db_manager: DatabaseManager) ->
     
     success = db_manager.delete_all_instances(
         credentials_file=args.output_file,
-        confirm=not args.force,
+        confirm=None if args.force else confirm_deletion,
         base_name=base_name
     )
     
@@ -105,6 +129,7 @@ def main() -> None:
     setup_logging(args.log_level)
     
     logger = logging.getLogger(__name__)
+    db_manager = None
     
     try:
         validate_environment()
@@ -152,6 +177,9 @@ def main() -> None:
     except Exception as e:
         logger.error(f"❌ Setup failed: {e}")
         sys.exit(1)
+    finally:
+        if db_manager:
+            db_manager.close()
 
 if __name__ == "__main__":
     main()